@@ -1,4 +1,5 @@
 """Dependency injection for Nestr application."""
+from functools import lru_cache
 from typing import Optional
 from .config import settings
 
@@ -54,6 +55,7 @@ class RSSGenerator:
         """Check if RSS generation is available."""
         return True
     
+    @lru_cache(maxsize=4096)
     def generate_rss_url(self, user_id: str) -> str:
         """Generate RSS URL for user."""
         if self.test_mode:
@@ -61,31 +63,19 @@ class RSSGenerator:
         return f"https://nestr.app/rss/{user_id}.xml"
 
 
-# Global instances
-_openai_manager: Optional[OpenAIManager] = None
-_supabase_manager: Optional[SupabaseManager] = None
-_rss_generator: Optional[RSSGenerator] = None
-
-
+@lru_cache(maxsize=1)
 def get_openai_manager() -> OpenAIManager:
     """Get OpenAI manager instance."""
-    global _openai_manager
-    if _openai_manager is None:
-        _openai_manager = OpenAIManager()
-    return _openai_manager
+    return OpenAIManager()
 
 
+@lru_cache(maxsize=1)
 def get_supabase_manager() -> SupabaseManager:
     """Get Supabase manager instance."""
-    global _supabase_manager
-    if _supabase_manager is None:
-        _supabase_manager = SupabaseManager()
-    return _supabase_manager
+    return SupabaseManager()
 
 
+@lru_cache(maxsize=1)
 def get_rss_generator() -> RSSGenerator:
     """Get RSS generator instance."""
-    global _rss_generator
-    if _rss_generator is None:
-        _rss_generator = RSSGenerator()
-    return _rss_generator
+    return RSSGenerator()
@@ -1,20 +1,30 @@
 """Main FastAPI application for Nestr - AI-powered podcast generation platform."""
+import asyncio
 import json
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import httpx
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import settings
 from .models import HealthResponse, TelegramWebhookRequest
 from .router_webhooks import router as webhooks_router
 from .deps import get_openai_manager, get_supabase_manager, get_rss_generator
 from .pipeline_manager import PipelineManager
-from .utils import default_metadata_for_generation
+from .utils import default_metadata_for_generation, telegram_user_uuid
 
 
 # Logging configuration with colors and formats
@@ -88,14 +98,22 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_entry)
+        if orjson is not None:
+            return orjson.dumps(log_entry).decode()
+        return json.dumps(log_entry, separators=(",", ":"))
+
+
+# Background listener doing handler I/O off the request path
+_log_listener: Optional[QueueListener] = None
 
 
 def setup_logging():
     """Configure the logging system in a simple way."""
+    global _log_listener
+
     # Basic logging configuration
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
-    
+
     # Simple and clear configuration
     logging.basicConfig(
         level=log_level,
@@ -103,7 +121,18 @@ def setup_logging():
         datefmt="%H:%M:%S",
         force=True  # Force reconfiguration
     )
-    
+
+    # Make logging non-blocking: request handlers only enqueue records,
+    # a listener thread performs the actual stream writes
+    root_logger = logging.getLogger()
+    stream_handlers = root_logger.handlers[:]
+    log_queue = queue.Queue(maxsize=10000)
+    for handler in stream_handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _log_listener = QueueListener(log_queue, *stream_handlers, respect_handler_level=True)
+    _log_listener.start()
+
     # Main logger
     logger = logging.getLogger("nester")
     
@@ -113,17 +142,93 @@ def setup_logging():
         logger.info("🚀 PRODUCTION mode")
 
 
+# Shared HTTP client for outbound calls (Telegram API), created lazily
+# and closed on application shutdown
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+    return _http_client
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle manager."""
     # Startup
     setup_logging()
     logging.info("Nestr application started")
-    
+
     yield
-    
+
     # Shutdown
+    global _http_client, _log_listener
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
     logging.info("Nestr application stopped")
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+# Telegram commands that trigger podcast generation
+PODCAST_COMMANDS = frozenset({"/wellness", "/briefing", "/other", "/others"})
+
+# Static Telegram message templates, built once at import time
+CODE_PROMPT_TEXT = (
+    "🔐 <b>Welcome to Nestr!</b>\n\n"
+    "To access the bot, please enter your access code.\n\n"
+    "This code corresponds to your ID in our system.\n\n"
+    "💡 <i>Simply enter your numeric code</i>"
+)
+
+ONBOARDING_TEXT = """🎉 <b>Welcome to Nestr!</b>
+
+<b>What is Nestr?</b>
+Nestr is your personal assistant for creating custom podcasts. I can generate audio episodes on any topic you want.
+
+<b>Available commands:</b>
+• <code>/wellness [topic]</code> - Wellness and health podcast
+• <code>/briefing [topic]</code> - News and information podcast
+• <code>/other [topic]</code> - Dialogue and discussion podcast
+• <code>/help</code> - Show this help
+
+<b>Usage examples:</b>
+• <code>/wellness Create a podcast about morning meditation</code>
+• <code>/briefing Summarize this week's tech news</code>
+• <code>/other Discuss AI trends in 2024</code>
+
+<b>How it works:</b>
+1. Choose a podcast type
+2. Describe your topic
+3. I generate a personalized audio episode
+4. The episode is added to your personal RSS feed
+
+🚀 <i>Ready to create your first podcast?</i>"""
+
+HELP_TEXT = """🤖 <b>Nestr Bot Commands</b>
+
+<b>Podcast generation:</b>
+• <code>/wellness [message]</code> - Wellness podcast
+• <code>/briefing [message]</code> - News briefing podcast
+• <code>/other [message]</code> - Dialogue podcast
+• <code>/others [message]</code> - Alias for /other
+
+<b>Examples:</b>
+• <code>/wellness Create a podcast about morning meditation</code>
+• <code>/briefing Summarize this week's tech news</code>
+• <code>/other Discuss AI trends in 2024</code>
+• <code>/others I want a podcast about Tchaikovsky's Symphony No. 5</code>
+
+<b>Other commands:</b>
+• <code>/help</code> - Show this help"""
 
 
 # Create FastAPI application
@@ -149,7 +254,6 @@ app.add_middleware(
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Middleware to log all HTTP requests."""
-    import time
     start_time = time.time()
     
     # Main logger
@@ -157,7 +261,7 @@ async def log_requests(request: Request, call_next):
     
     # Log incoming request (simplified)
     if request.url.path != "/healthz":
-        logger.info(f"🌐 {request.method} {request.url.path}")
+        logger.info("🌐 %s %s", request.method, request.url.path)
     
     # Process request
     response = await call_next(request)
@@ -169,7 +273,16 @@ async def log_requests(request: Request, call_next):
     # Log response (only if not health check)
     if request.url.path != "/healthz":
         status_emoji = "✅" if response.status_code < 400 else "❌"
-        logger.info(f"{status_emoji} {request.method} {request.url.path} | {response.status_code} | {duration_ms}ms")
+        logger.info(
+            "%s %s %s | %s | %sms",
+            status_emoji, request.method, request.url.path, response.status_code, duration_ms,
+            extra={
+                "method": request.method,
+                "url": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": duration_ms,
+            },
+        )
     
     return response
 
@@ -217,7 +330,7 @@ async def telegram_webhook(update: TelegramWebhookRequest):
         
         # Handle non-text messages (stickers, photos, etc.)
         if not update.message.text:
-            logger.info(f"Non-text message received from {update.message.from_user.id}, ignored")
+            logger.info("Non-text message received from %s, ignored", update.message.from_user.id)
             return {"ok": True}
         
         # Get Telegram user ID
@@ -225,30 +338,31 @@ async def telegram_webhook(update: TelegramWebhookRequest):
         message_text = update.message.text.strip()
         chat_id = update.message.chat.get("id")
         
-        logger.info(f"📱 Telegram message received from {user_id} (chat: {chat_id}): {message_text}")
-        logger.info(f"🔧 Configuration: token={'***' if settings.telegram_token else 'MISSING'}, service_id={settings.telegram_service_id}")
+        logger.info("📱 Telegram message received from %s (chat: %s): %s", user_id, chat_id, message_text)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 Configuration: token=%s, service_id=%s", "***" if settings.telegram_token else "MISSING", settings.telegram_service_id)
         
         # Check authentication
         if user_id != settings.telegram_service_id:
-            logger.warning(f"🚫 Unauthorized user {user_id}, starting onboarding")
+            logger.warning("🚫 Unauthorized user %s, starting onboarding", user_id)
             await handle_unauthorized_user(chat_id, user_id, message_text)
             return {"ok": True}
         
         # User is authorized, process commands
-        logger.info(f"✅ Authorized user {user_id}, processing command")
+        logger.info("✅ Authorized user %s, processing command", user_id)
         
         # Parse commands
         if message_text.startswith('/'):
-            logger.info(f"🔍 Command detected: {message_text}")
+            logger.debug("🔍 Command detected: %s", message_text)
             await handle_telegram_command(chat_id, message_text, user_id)
         else:
             # Non-command message, ignore silently
-            logger.info(f"📝 Non-command message ignored: {message_text}")
+            logger.debug("📝 Non-command message ignored: %s", message_text)
         
         return {"ok": True}
         
     except Exception as e:
-        logger.error(f"❌ Error in Telegram webhook: {str(e)}")
+        logger.error("❌ Error in Telegram webhook: %s", e)
         return {"ok": False, "error": str(e)}
 
 
@@ -263,23 +377,18 @@ async def handle_unauthorized_user(chat_id: int, user_id: str, message_text: str
             if await validate_onboarding_code(message_text):
                 # Valid code, send onboarding message
                 await send_onboarding_message(chat_id)
-                logger.info(f"✅ Valid onboarding code for {user_id}: {message_text}")
+                logger.info("✅ Valid onboarding code for %s: %s", user_id, message_text)
             else:
                 # Invalid code
                 await send_telegram_message(chat_id, "❌ Invalid code. Please enter a valid code or contact the administrator.")
-                logger.warning(f"❌ Invalid onboarding code from {user_id}: {message_text}")
+                logger.warning("❌ Invalid onboarding code from %s: %s", user_id, message_text)
         else:
             # First message, ask for code
-            await send_telegram_message(chat_id, 
-                "🔐 <b>Welcome to Nestr!</b>\n\n"
-                "To access the bot, please enter your access code.\n\n"
-                "This code corresponds to your ID in our system.\n\n"
-                "💡 <i>Simply enter your numeric code</i>"
-            )
-            logger.info(f"📝 Onboarding code request for {user_id}")
+            await send_telegram_message(chat_id, CODE_PROMPT_TEXT)
+            logger.info("📝 Onboarding code request for %s", user_id)
             
     except Exception as e:
-        logger.error(f"❌ Error during onboarding for {user_id}: {str(e)}")
+        logger.error("❌ Error during onboarding for %s: %s", user_id, e)
         await send_telegram_message(chat_id, "❌ An error occurred. Please try again.")
 
 
@@ -293,51 +402,30 @@ async def validate_onboarding_code(code: str) -> bool:
         
         if supabase_manager.test_mode:
             # In test mode, accept any numeric code
-            logger.info(f"Test mode - Code accepted: {code}")
+            logger.info("Test mode - Code accepted: %s", code)
             return True
         
         # Check if the code exists in the users table
-        result = supabase_manager.client.table("users").select("id").eq("id", code).execute()
+        # (supabase-py is synchronous: run the query off the event loop)
+        result = await asyncio.to_thread(
+            lambda: supabase_manager.client.table("users").select("id").eq("id", code).execute()
+        )
         
         if result.data and len(result.data) > 0:
-            logger.info(f"✅ Valid onboarding code found: {code}")
+            logger.info("✅ Valid onboarding code found: %s", code)
             return True
         else:
-            logger.warning(f"❌ Onboarding code not found: {code}")
+            logger.warning("❌ Onboarding code not found: %s", code)
             return False
             
     except Exception as e:
-        logger.error(f"❌ Error validating code {code}: {str(e)}")
+        logger.error("❌ Error validating code %s: %s", code, e)
         return False
 
 
 async def send_onboarding_message(chat_id: int):
     """Send the onboarding message with available commands."""
-    onboarding_text = """🎉 <b>Welcome to Nestr!</b>
-
-<b>What is Nestr?</b>
-Nestr is your personal assistant for creating custom podcasts. I can generate audio episodes on any topic you want.
-
-<b>Available commands:</b>
-• <code>/wellness [topic]</code> - Wellness and health podcast
-• <code>/briefing [topic]</code> - News and information podcast  
-• <code>/other [topic]</code> - Dialogue and discussion podcast
-• <code>/help</code> - Show this help
-
-<b>Usage examples:</b>
-• <code>/wellness Create a podcast about morning meditation</code>
-• <code>/briefing Summarize this week's tech news</code>
-• <code>/other Discuss AI trends in 2024</code>
-
-<b>How it works:</b>
-1. Choose a podcast type
-2. Describe your topic
-3. I generate a personalized audio episode
-4. The episode is added to your personal RSS feed
-
-🚀 <i>Ready to create your first podcast?</i>"""
-
-    await send_telegram_message(chat_id, onboarding_text)
+    await send_telegram_message(chat_id, ONBOARDING_TEXT)
 
 
 async def send_telegram_message(chat_id: int, text: str):
@@ -354,16 +442,16 @@ async def send_telegram_message(chat_id: int, text: str):
             "parse_mode": "HTML"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=data)
-            response.raise_for_status()
+        client = get_http_client()
+        response = await client.post(url, json=data)
+        response.raise_for_status()
             
         logger = logging.getLogger("nester")
-        logger.info(f"📤 Telegram message sent to {chat_id}")
+        logger.info("📤 Telegram message sent to %s", chat_id)
         
     except Exception as e:
         logger = logging.getLogger("nester")
-        logger.error(f"❌ Error sending Telegram message: {str(e)}")
+        logger.error("❌ Error sending Telegram message: %s", e)
         # Don't crash the webhook, just log the error
         return
 
@@ -378,10 +466,10 @@ async def handle_telegram_command(chat_id: int, command: str, user_id: str):
         cmd = parts[0].lower()
         message = parts[1] if len(parts) > 1 else ""
         
-        logger.info(f"🔧 Processing command: '{cmd}' with message: '{message}'")
+        logger.debug("🔧 Processing command: '%s' with message: '%s'", cmd, message)
         
         # Supported commands
-        if cmd in ['/wellness', '/briefing', '/other', '/others']:
+        if cmd in PODCAST_COMMANDS:
             # Handle /others -> /other variant
             if cmd == '/others':
                 cmd = '/other'
@@ -400,30 +488,13 @@ async def handle_telegram_command(chat_id: int, command: str, user_id: str):
             await generate_telegram_podcast(chat_id, user_id, intent, message)
             
         elif cmd == '/help':
-            help_text = """🤖 <b>Nestr Bot Commands</b>
-
-<b>Podcast generation:</b>
-• <code>/wellness [message]</code> - Wellness podcast
-• <code>/briefing [message]</code> - News briefing podcast
-• <code>/other [message]</code> - Dialogue podcast
-• <code>/others [message]</code> - Alias for /other
-
-<b>Examples:</b>
-• <code>/wellness Create a podcast about morning meditation</code>
-• <code>/briefing Summarize this week's tech news</code>
-• <code>/other Discuss AI trends in 2024</code>
-• <code>/others I want a podcast about Tchaikovsky's Symphony No. 5</code>
-
-<b>Other commands:</b>
-• <code>/help</code> - Show this help"""
-            
-            await send_telegram_message(chat_id, help_text)
+            await send_telegram_message(chat_id, HELP_TEXT)
             
         else:
             await send_telegram_message(chat_id, f"❌ Unknown command: {cmd}\n\nType /help to see available commands.")
             
     except Exception as e:
-        logger.error(f"❌ Error processing Telegram command: {str(e)}")
+        logger.error("❌ Error processing Telegram command: %s", e)
         await send_telegram_message(chat_id, f"❌ Error processing command: {str(e)}")
 
 
@@ -441,8 +512,7 @@ async def generate_telegram_podcast(chat_id: int, user_id: str, intent: str, mes
         pipeline_manager = PipelineManager(openai_manager, supabase_manager, rss_generator)
         
         # Create stable UUID from Telegram ID
-        from uuid import uuid5, NAMESPACE_DNS
-        telegram_uuid = uuid5(NAMESPACE_DNS, f"telegram-{user_id}")
+        telegram_uuid = telegram_user_uuid(user_id)
         
         # Resolve user with generated UUID
         resolved_user_id = supabase_manager.resolve_user(telegram_uuid, None, None)
@@ -451,7 +521,7 @@ async def generate_telegram_podcast(chat_id: int, user_id: str, intent: str, mes
         metadata = default_metadata_for_generation(message)
         
         # Generate podcast
-        logger.info(f"🎙️ Generating {intent} podcast for Telegram user {user_id}")
+        logger.info("🎙️ Generating %s podcast for Telegram user %s", intent, user_id)
         result = await pipeline_manager.generate_podcast(
             user_id=resolved_user_id,
             message=message,
@@ -471,16 +541,16 @@ async def generate_telegram_podcast(chat_id: int, user_id: str, intent: str, mes
 The podcast has been added to your personal RSS feed."""
             
             await send_telegram_message(chat_id, success_message)
-            logger.info(f"✅ {intent} podcast generated successfully for Telegram user {user_id}")
+            logger.info("✅ %s podcast generated successfully for Telegram user %s", intent, user_id)
             
         else:
             # Error
             error_message = f"❌ <b>Error generating {intent} podcast</b>\n\n{result.get('message', 'Unknown error')}"
             await send_telegram_message(chat_id, error_message)
-            logger.error(f"❌ Failed to generate {intent} podcast for Telegram user {user_id}: {result.get('message')}")
+            logger.error("❌ Failed to generate %s podcast for Telegram user %s: %s", intent, user_id, result.get("message"))
             
     except Exception as e:
-        logger.error(f"❌ Error generating Telegram podcast: {str(e)}")
+        logger.error("❌ Error generating Telegram podcast: %s", e)
         await send_telegram_message(chat_id, f"❌ <b>Technical error</b>\n\nAn unexpected error occurred while generating the podcast.")
 
 
@@ -499,7 +569,7 @@ async def global_exception_handler(request: Request, exc: Exception):
             "url": str(request.url),
             "error": str(exc),
             "error_type": type(exc).__name__
-        })
+        }, separators=(",", ":"))
     )
     
     return JSONResponse(
@@ -1,5 +1,5 @@
 """Pydantic models for Nestr application."""
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Literal
 from pydantic import BaseModel
 
 
@@ -41,7 +41,7 @@ class TelegramWebhookRequest(BaseModel):
 class PodcastGenerationRequest(BaseModel):
     """Podcast generation request model."""
     message: str
-    intent: str = "other"
+    intent: Literal["briefing", "wellness", "other"] = "other"
     lang: str = "fr"
     metadata: Optional[Dict[str, Any]] = None
 
@@ -1,26 +1,105 @@
 """Pipeline manager for podcast generation."""
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import time
+from typing import Dict, Any, Optional, Tuple
 from .deps import OpenAIManager, SupabaseManager, RSSGenerator
 
+# Maximum number of completed generations kept in the content-hash cache
+RESULT_CACHE_MAX = 128
+
+# Seconds an identical request replays the previous result instead of
+# re-running the pipeline (short window: retries/replays, not memoization)
+RESULT_CACHE_TTL = 60.0
+
 
 class PipelineManager:
     """Manages podcast generation pipelines."""
-    
+
+    # Recently completed generations keyed by content hash, shared across
+    # instances; entries hold (monotonic timestamp, result) and expire
+    # after RESULT_CACHE_TTL
+    _result_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    # In-flight generations keyed by content hash; duplicate requests
+    # (retries, double-clicks, webhook replays) await the same future
+    # instead of running the pipeline twice
+    _inflight: Dict[str, "asyncio.Future"] = {}
+
     def __init__(self, openai_manager: OpenAIManager, supabase_manager: SupabaseManager, rss_generator: RSSGenerator):
         self.openai_manager = openai_manager
         self.supabase_manager = supabase_manager
         self.rss_generator = rss_generator
-    
+
+    @staticmethod
+    def _content_key(user_id: str, message: str, lang: str, intent: str) -> str:
+        """Build a stable cache key for one generation request."""
+        return hashlib.blake2s(f"{user_id}|{intent}|{lang}|{message}".encode()).hexdigest()
+
     async def generate_podcast(
-        self, 
-        user_id: str, 
-        message: str, 
-        lang: str = "fr", 
-        intent: str = "other", 
+        self,
+        user_id: str,
+        message: str,
+        lang: str = "fr",
+        intent: str = "other",
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Generate a podcast using the specified pipeline."""
-        
+
+        # Identical requests within the TTL window short-circuit to the
+        # previously generated result
+        cache_key = self._content_key(user_id, message, lang, intent)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            cached_at, cached_result = cached
+            if time.monotonic() - cached_at < RESULT_CACHE_TTL:
+                return cached_result
+            del self._result_cache[cache_key]
+
+        # Identical request already running: share its result
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._run_pipeline(user_id, message, lang, intent, metadata)
+            future.set_result(result)
+        except Exception as e:
+            # _run_pipeline catches its own errors; this is a safety net
+            result = {
+                "status": "error",
+                "message": f"Error generating podcast: {str(e)}"
+            }
+            future.set_result(result)
+        finally:
+            self._inflight.pop(cache_key, None)
+            # A cancelled owner task (client disconnect, shutdown) skips
+            # except Exception; release any waiters instead of leaking a
+            # forever-pending future
+            if not future.done():
+                future.cancel()
+
+        # Only successful generations are worth replaying
+        if result["status"] == "success":
+            if len(self._result_cache) >= RESULT_CACHE_MAX:
+                # Drop the oldest entry (dicts preserve insertion order)
+                self._result_cache.pop(next(iter(self._result_cache)))
+            self._result_cache[cache_key] = (time.monotonic(), result)
+
+        return result
+
+    async def _run_pipeline(
+        self,
+        user_id: str,
+        message: str,
+        lang: str,
+        intent: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Run the actual generation pipeline for one request."""
+
         try:
             # For now, return a simple mock response
             # In a real implementation, this would:
@@ -28,7 +107,7 @@ class PipelineManager:
             # 2. Convert text to speech
             # 3. Store in Supabase
             # 4. Update RSS feed
-            
+
             if self.openai_manager.test_mode:
                 return {
                     "status": "success",
@@ -44,7 +123,7 @@ class PipelineManager:
                     "status": "error",
                     "message": "OpenAI API not configured. Please set OPENAI_API_KEY environment variable."
                 }
-                
+
         except Exception as e:
             return {
                 "status": "error",
@@ -1,45 +1,49 @@
 """Utility functions for Nestr application."""
+import hashlib
+import re
+from time import gmtime, strftime
 from typing import Dict, Any
-from datetime import datetime
+from functools import lru_cache
+from uuid import UUID, uuid5, NAMESPACE_DNS
+
+# Characters not allowed in stored filenames
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
 
 
 def default_metadata_for_generation(message: str) -> Dict[str, Any]:
     """Generate default metadata for podcast generation."""
     return {
         "message": message,
-        "generated_at": datetime.utcnow().isoformat(),
+        "generated_at": strftime("%Y-%m-%dT%H:%M:%S+00:00", gmtime()),
         "source": "api",
         "version": "1.0.0"
     }
 
 
+@lru_cache(maxsize=10_000)
+def telegram_user_uuid(telegram_id: str) -> UUID:
+    """Deterministic UUID for a Telegram user ID (cached: uuid5 is a SHA-1)."""
+    return uuid5(NAMESPACE_DNS, f"telegram-{telegram_id}")
+
+
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage."""
-    import re
-    # Remove or replace invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    # Limit length
-    if len(filename) > 100:
-        filename = filename[:100]
-    return filename
+    # Replace invalid characters and limit length
+    return _INVALID_FILENAME_CHARS.sub('_', filename)[:100]
 
 
 def format_duration(seconds: int) -> str:
     """Format duration in seconds to human readable format."""
-    if seconds < 60:
-        return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
-        return f"{minutes}m {remaining_seconds}s"
-    else:
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
         return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs}s"
+    return f"{secs}s"
 
 
-def generate_episode_id(user_id: str, timestamp: str) -> str:
+def generate_episode_id(user_id: str, timestamp: str, _blake2s=hashlib.blake2s) -> str:
     """Generate unique episode ID."""
-    import hashlib
     content = f"{user_id}-{timestamp}"
-    return hashlib.md5(content.encode()).hexdigest()[:12]
+    return _blake2s(content.encode(), digest_size=6).hexdigest()